@@ -1,46 +1,60 @@
-from retirement_planner import analyze_retirement_options, FinGoal
+from retirement_planner import compute_retirement_options, FinGoal
 from house_planner import calculate_annual_saving
 from finlib import calculate_post_tax_income
 
-if __name__ == "__main__":
-    goal = FinGoal.Sustainable
-    income = 126000
-    rate_of_return = 0.09  # Expected return
-    current_age = 26
-    expected_retirement_age = 56
-    expected_lifespan = 85
-    
+# Monthly living expenses: rent, groceries, utilities, gas
+MONTHLY_EXPENSES_TOTAL = 1600 + 500 + 200 + 150
+
+
+def run_plan(income: float, monthly_expenses_total: float,
+             goal: FinGoal = FinGoal.Sustainable,
+             rate_of_return: float = 0.09,
+             current_age: int = 26,
+             expected_retirement_age: int = 56,
+             expected_lifespan: int = 85,
+             house_price: float = 800000,
+             hysa_rate: float = 0.04,
+             time_to_purchase: int = 5,
+             verbose: bool = False) -> float:
+    """
+    Budget retirement and house down payment savings against living expenses.
+
+    Args:
+        income: Gross annual income
+        monthly_expenses_total: Total monthly living expenses
+        goal: Financial goal for retirement (from FinGoal enum)
+        rate_of_return: Expected investment return rate
+        current_age: Current age in years
+        expected_retirement_age: Age at retirement
+        expected_lifespan: Age at end of retirement
+        house_price: Target house price
+        hysa_rate: Savings account rate for the down payment fund
+        time_to_purchase: Years until the house purchase
+        verbose: Print each account's yearly contribution and share of income
+
+    Returns:
+        Money left over each month after Roth 401k and house savings and expenses
+    """
     working_years = expected_retirement_age - current_age
     retirement_years = expected_lifespan - expected_retirement_age
-    real_income = calculate_post_tax_income(income)[0]  # Post-tax income
-    sustainable = analyze_retirement_options(
+    real_income = calculate_post_tax_income(income).post_tax_income
+    sustainable = compute_retirement_options(
         real_income, rate_of_return, working_years, retirement_years, goal, filing_status='single')
-    
-    percents = {}
-    for account_name, account_data in sustainable.items():
-        print(f"{account_name}: {account_data['Yearly Contribution']} ({account_data['Yearly Contribution']/real_income:.1%})")
-        percents[account_name] = account_data['Yearly Contribution']/real_income
-        
-    house_price = 800000
-    hysa_rate = 0.04
-    time_to_purchase = 5
-    annual_house_save, monthly_house_save = calculate_annual_saving(house_price, hysa_rate, time_to_purchase)
-    save_percent = annual_house_save / real_income
-    
-    
-    monthly_expenses = {
-        "Rent": 1600,
-        "Groceries": 500,
-        "Utilities": 200,
-        "Gas": 150,
-    }
-    annual_costs = sum(monthly_expenses.values()) * 12
-    
-    money_left = real_income - (annual_house_save + annual_costs + sustainable['Roth 401k']['Yearly Contribution'])
-    money_left_per_month = money_left / 12
+
+    if verbose:
+        inv_income = 1.0 / real_income
+        percents = {account_name: account_data.yearly_contribution * inv_income
+                    for account_name, account_data in sustainable.items()}
+        print("\n".join(f"{account_name}: {sustainable[account_name].yearly_contribution} ({percent:.1%})"
+                        for account_name, percent in percents.items()))
+
+    annual_house_save, _ = calculate_annual_saving(house_price, hysa_rate, time_to_purchase)
+    annual_costs = monthly_expenses_total * 12
+
+    money_left = real_income - (annual_house_save + annual_costs + sustainable['Roth 401k'].yearly_contribution)
+    return money_left / 12
+
+
+if __name__ == "__main__":
+    money_left_per_month = run_plan(126000, MONTHLY_EXPENSES_TOTAL, verbose=True)
     print(money_left_per_month)
-        
-    
-        
-    
-        
\ No newline at end of file
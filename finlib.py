@@ -1,3 +1,224 @@
+from bisect import bisect_left
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # Numba is optional; the kernels then run as plain Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the decorated function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import finlib_kernels as _aot_kernels  # built by finlib_aot.py
+except ImportError:
+    _aot_kernels = None
+
+# Kernel name -> (Numba signature, Python function), read by finlib_aot.py
+KERNELS = {}
+
+
+def compiled_kernel(signature: str):
+    """
+    Compile a scalar numeric kernel with the given Numba signature.
+
+    Uses the ahead-of-time compiled version from finlib_kernels when it has
+    been built, so no JIT compilation happens at import; otherwise falls back
+    to njit (or plain Python when Numba is not installed).
+    """
+    def decorate(func):
+        KERNELS[func.__name__] = (signature, func)
+        if hasattr(_aot_kernels, func.__name__):
+            return getattr(_aot_kernels, func.__name__)
+        return njit(signature, cache=True, fastmath=True)(func)
+    return decorate
+
+# Tax tables are read-only mappings keyed by filing status. The keys are string
+# literals, so CPython interns them and lookups with literal statuses hit on identity
+
+# 2024 federal income tax brackets: (bracket ceiling, marginal rate). The top
+# bracket is capped at a finite ceiling no real income reaches, so every bracket
+# has a finite width
+_BRACKETS = MappingProxyType({
+    'single': [
+        (11600, 0.10),
+        (47150, 0.12),
+        (100525, 0.22),
+        (191950, 0.24),
+        (243725, 0.32),
+        (609350, 0.35),
+        (1e12, 0.37)
+    ],
+    'married_joint': [
+        (23200, 0.10),
+        (94300, 0.12),
+        (201050, 0.22),
+        (383900, 0.24),
+        (487450, 0.32),
+        (731200, 0.35),
+        (1e12, 0.37)
+    ],
+    'married_separate': [
+        (11600, 0.10),
+        (47150, 0.12),
+        (100525, 0.22),
+        (191950, 0.24),
+        (243725, 0.32),
+        (365600, 0.35),
+        (1e12, 0.37)
+    ],
+    'head_household': [
+        (16550, 0.10),
+        (63100, 0.12),
+        (100500, 0.22),
+        (191950, 0.24),
+        (243700, 0.32),
+        (609350, 0.35),
+        (1e12, 0.37)
+    ]
+})
+
+# Standard deduction 2024
+_STD_DEDUCTION = MappingProxyType({
+    'single': 14600,
+    'married_joint': 29200,
+    'married_separate': 14600,
+    'head_household': 21900
+})
+
+# 2024 capital gains tax brackets
+_CG_BRACKETS = MappingProxyType({
+    'single': [
+        (44625, 0.0),
+        (492300, 0.15),
+        (float('inf'), 0.20)
+    ],
+    'married_joint': [
+        (89250, 0.0),
+        (553850, 0.15),
+        (float('inf'), 0.20)
+    ],
+    'married_separate': [
+        (44625, 0.0),
+        (276900, 0.15),
+        (float('inf'), 0.20)
+    ],
+    'head_household': [
+        (59750, 0.0),
+        (523050, 0.15),
+        (float('inf'), 0.20)
+    ]
+})
+
+_SOCIAL_SECURITY_CAP = 168600
+
+# Additional Medicare Tax thresholds
+_ADDL_MEDICARE_THRESHOLD = MappingProxyType({
+    'single': 200000,
+    'married_joint': 250000,
+    'married_separate': 125000,
+    'head_household': 200000
+})
+
+_VALID_STATUSES = frozenset(
+    {'single', 'married_joint', 'married_separate', 'head_household'})
+
+# Bracket tables as parallel arrays, built once so the tax calculation is pure arithmetic:
+# bracket ceilings, plus (lower bounds, widths, marginal rates) for each filing status
+_THRESH = {status: np.array([top for top, _ in rows], dtype=float)
+           for status, rows in _BRACKETS.items()}
+_BRACKET_ARRAYS = {
+    status: (np.concatenate(([0.0], _THRESH[status][:-1])),
+             np.diff(np.concatenate(([0.0], _THRESH[status]))),
+             np.array([rate for _, rate in rows], dtype=float))
+    for status, rows in _BRACKETS.items()
+}
+# Tax owed on all brackets below each bracket's lower bound
+_CUM_TAX = {status: np.concatenate(([0.0], np.cumsum(widths[:-1] * rates[:-1])))
+            for status, (_, widths, rates) in _BRACKET_ARRAYS.items()}
+
+
+def _make_bracket_tax(status: str):
+    """
+    Generate the progressive bracket tax function for one filing status.
+
+    The brackets are folded into the source as literal ceilings and cumulative
+    taxes, so a call is a short chain of float comparisons with no table lookups.
+    """
+    lowers, _, rates = _BRACKET_ARRAYS[status]
+    cum_tax = _CUM_TAX[status]
+    lines = [f"def _bracket_tax_{status}(taxable_income):"]
+    for i, top in enumerate(_THRESH[status][:-1]):
+        lines.append(f"    if taxable_income <= {float(top)!r}:")
+        lines.append(f"        return {float(cum_tax[i])!r} + (taxable_income - {float(lowers[i])!r}) * {float(rates[i])!r}")
+    lines.append(f"    return {float(cum_tax[-1])!r} + (taxable_income - {float(lowers[-1])!r}) * {float(rates[-1])!r}")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace[f"_bracket_tax_{status}"]
+
+
+_BRACKET_TAX_FNS = {status: _make_bracket_tax(status) for status in _BRACKETS}
+
+_CG_THRESH = {status: tuple(top for top, _ in rows)
+              for status, rows in _CG_BRACKETS.items()}
+_CG_RATES = {status: tuple(rate for _, rate in rows)
+             for status, rows in _CG_BRACKETS.items()}
+
+
+# Below this many incomes, starting the worker threads costs more than it saves
+_PARALLEL_MIN_INCOMES = 10_000
+
+if HAS_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _bracket_tax(taxable, lowers, widths, rates):
+        """Progressive bracket tax on one taxable income; the top bracket has no ceiling."""
+        last = rates.shape[0] - 1
+        tax = max(0.0, taxable - lowers[last]) * rates[last]
+        for j in range(last):
+            tax += min(widths[j], max(0.0, taxable - lowers[j])) * rates[j]
+        return tax
+
+    @njit(fastmath=True, cache=True)
+    def _bracket_tax_batch(taxable, lowers, widths, rates):
+        """Progressive bracket tax for each taxable income in a batch."""
+        out = np.empty_like(taxable)
+        for i in range(taxable.shape[0]):
+            out[i] = _bracket_tax(taxable[i], lowers, widths, rates)
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _bracket_tax_batch_parallel(taxable, lowers, widths, rates):
+        """_bracket_tax_batch split across threads, for large batches."""
+        out = np.empty_like(taxable)
+        for i in prange(taxable.shape[0]):
+            out[i] = _bracket_tax(taxable[i], lowers, widths, rates)
+        return out
+
+
+@compiled_kernel("float64(float64, float64)")
+def _fica_tax(income, addl_medicare_threshold):
+    """Social Security and Medicare tax on a single income."""
+    ss_tax = min(income, _SOCIAL_SECURITY_CAP) * 0.062
+    medicare_tax = income * 0.0145
+
+    # Additional Medicare Tax for high earners
+    addl_medicare = 0.0
+    if income > addl_medicare_threshold:
+        addl_medicare = (income - addl_medicare_threshold) * 0.009
+
+    return ss_tax + medicare_tax + addl_medicare
+
+
+@compiled_kernel("float64(float64, float64, float64)")
 def constant_contribution(R: float, T: int, C: float) -> float:
     """
     Calculate final amount with constant contribution.
@@ -12,6 +233,12 @@ def constant_contribution(R: float, T: int, C: float) -> float:
     """
     return C * ((1 + R)**T - 1) / R
 
+@compiled_kernel("float64(float64, float64, float64)")
+def _required_constant_contribution_unchecked(target_amount: float, rate_of_return: float,
+                                              investment_duration: int) -> float:
+    """required_constant_contribution without validating rate_of_return."""
+    return (target_amount * rate_of_return) / ((1 + rate_of_return)**investment_duration - 1)
+
 def required_constant_contribution(target_amount: float, rate_of_return: float,
                                    investment_duration: int) -> float:
     """
@@ -27,30 +254,41 @@ def required_constant_contribution(target_amount: float, rate_of_return: float,
     """
     if rate_of_return <= 0:
         raise ValueError("Rate of return must be positive")
-    return (target_amount * rate_of_return) / ((1 + rate_of_return)**investment_duration - 1)
+    return _required_constant_contribution_unchecked(
+        target_amount, rate_of_return, investment_duration)
+
 
+@lru_cache(maxsize=4096)
 def calculate_fica(income: float, filing_status: str = 'single') -> float:
-    social_security_cap = 168600
-    ss_tax = min(income, social_security_cap) * 0.062
-    medicare_tax = income * 0.0145
+    return _fica_tax(income, _ADDL_MEDICARE_THRESHOLD[filing_status])
 
-    # Additional Medicare Tax for high earners
-    addl_medicare_threshold = {
-        'single': 200000,
-        'married_joint': 250000,
-        'married_separate': 125000,
-        'head_household': 200000
-    }
-
-    addl_medicare = 0
-    if income > addl_medicare_threshold[filing_status]:
-        addl_medicare = (
-            income - addl_medicare_threshold[filing_status]) * 0.009
 
-    return ss_tax + medicare_tax + addl_medicare
+def calculate_fica_batch(incomes: np.ndarray, filing_status: str = 'single') -> np.ndarray:
+    """
+    Calculate FICA tax for a whole array of incomes at once.
 
+    Vectorized counterpart of calculate_fica for income sweeps.
 
-def calculate_post_tax_income(income: float, filing_status: str = 'single') -> tuple:
+    Args:
+        incomes: Array of gross annual incomes
+        filing_status: Tax filing status ('single', 'married_joint', etc.)
+
+    Returns:
+        Array of FICA taxes
+    """
+    incomes = np.asarray(incomes, dtype=float)
+    return (np.minimum(incomes, _SOCIAL_SECURITY_CAP) * 0.062 + incomes * 0.0145
+            + np.maximum(0, incomes - _ADDL_MEDICARE_THRESHOLD[filing_status]) * 0.009)
+
+
+class TaxResult(NamedTuple):
+    """Income left after federal income tax and FICA, and the share of it taxed."""
+    post_tax_income: float
+    effective_tax_rate: float
+
+
+@lru_cache(maxsize=4096)
+def calculate_post_tax_income(income: float, filing_status: str = 'single') -> TaxResult:
     """
     Calculate post-tax income using progressive tax brackets (2024 rates).
 
@@ -59,85 +297,66 @@ def calculate_post_tax_income(income: float, filing_status: str = 'single') -> t
         filing_status: Tax filing status ('single', 'married_joint', etc.)
 
     Returns:
-        Tuple of (post-tax income, effective tax rate)
-    """
-    brackets = {
-        'single': [
-            (11600, 0.10),
-            (47150, 0.12),
-            (100525, 0.22),
-            (191950, 0.24),
-            (243725, 0.32),
-            (609350, 0.35),
-            (float('inf'), 0.37)
-        ],
-        'married_joint': [
-            (23200, 0.10),
-            (94300, 0.12),
-            (201050, 0.22),
-            (383900, 0.24),
-            (487450, 0.32),
-            (731200, 0.35),
-            (float('inf'), 0.37)
-        ],
-        'married_separate': [
-            (11600, 0.10),
-            (47150, 0.12),
-            (100525, 0.22),
-            (191950, 0.24),
-            (243725, 0.32),
-            (365600, 0.35),
-            (float('inf'), 0.37)
-        ],
-        'head_household': [
-            (16550, 0.10),
-            (63100, 0.12),
-            (100500, 0.22),
-            (191950, 0.24),
-            (243700, 0.32),
-            (609350, 0.35),
-            (float('inf'), 0.37)
-        ]
-    }
-
-    if filing_status not in brackets:
+        TaxResult of (post-tax income, effective tax rate)
+    """
+    if filing_status not in _VALID_STATUSES:
         raise ValueError(
-            f"Invalid filing status. Must be one of: {', '.join(brackets.keys())}")
-
-    # Standard deduction 2024
-    std_deduction = {
-        'single': 14600,
-        'married_joint': 29200,
-        'married_separate': 14600,
-        'head_household': 21900
-    }
+            f"Invalid filing status. Must be one of: {', '.join(_BRACKETS.keys())}")
 
     # Apply standard deduction
-    taxable_income = max(0, income - std_deduction[filing_status])
+    taxable_income = max(0, income - _STD_DEDUCTION[filing_status])
+
+    # Calculate tax using progressive brackets: every bracket below the one the
+    # income tops out in is taxed in full, and that one only up to the income.
+    # Incomes within the standard deduction owe no income tax, only FICA
+    if taxable_income == 0:
+        total_tax = 0.0
+    else:
+        total_tax = _BRACKET_TAX_FNS[filing_status](taxable_income)
 
-    total_tax = 0
-    previous_bracket = 0
+    tax = total_tax + calculate_fica(income, filing_status)
 
-    # Calculate tax using progressive brackets
-    for bracket_max, rate in brackets[filing_status]:
-        if taxable_income > previous_bracket:
-            taxable_in_bracket = min(
-                taxable_income - previous_bracket, bracket_max - previous_bracket)
-            tax_in_bracket = taxable_in_bracket * rate
-            total_tax += tax_in_bracket
+    return TaxResult(income - tax, tax / income if income > 0 else 0.0)
 
-            if taxable_income <= bracket_max:
-                break
 
-        previous_bracket = bracket_max
+def calculate_post_tax_income_batch(incomes: np.ndarray, filing_status: str = 'single') -> TaxResult:
+    """
+    Calculate post-tax income for a whole array of incomes at once.
+
+    Vectorized counterpart of calculate_post_tax_income for income sweeps.
+
+    Args:
+        incomes: Array of gross annual incomes
+        filing_status: Tax filing status ('single', 'married_joint', etc.)
+
+    Returns:
+        TaxResult of (post-tax income array, effective tax rate array)
+    """
+    if filing_status not in _VALID_STATUSES:
+        raise ValueError(
+            f"Invalid filing status. Must be one of: {', '.join(_BRACKETS.keys())}")
+
+    incomes = np.asarray(incomes, dtype=float)
+    taxable_income = np.maximum(0, incomes - _STD_DEDUCTION[filing_status])
+    lowers, widths, rates = _BRACKET_ARRAYS[filing_status]
+    if HAS_NUMBA:
+        flat_taxable = np.atleast_1d(taxable_income).ravel()
+        kernel = (_bracket_tax_batch_parallel if flat_taxable.size >= _PARALLEL_MIN_INCOMES
+                  else _bracket_tax_batch)
+        total_tax = kernel(flat_taxable, lowers, widths, rates).reshape(taxable_income.shape)
+    else:
+        # Full tax on the brackets below the one each income tops out in, plus
+        # that bracket's rate on the rest
+        top = np.searchsorted(_THRESH[filing_status][:-1], taxable_income)
+        total_tax = _CUM_TAX[filing_status][top] + (taxable_income - lowers[top]) * rates[top]
 
-    fica_tax = calculate_fica(income, filing_status)
-    post_tax_income = income - total_tax - fica_tax
-    effective_tax_rate = ((total_tax + fica_tax) / income) if income > 0 else 0
+    tax = total_tax + calculate_fica_batch(incomes, filing_status)
+    effective_tax_rate = np.divide(tax, incomes, out=np.zeros_like(incomes), where=incomes > 0)
 
-    return post_tax_income, effective_tax_rate
+    return TaxResult(incomes - tax, effective_tax_rate)
 
 
+@lru_cache(maxsize=256)
 def calculate_capital_gains_tax(gain_amount: float, regular_income: float, filing_status: str = 'single') -> float:
     """
     Calculate capital gains tax based on 2024 rates.
@@ -150,38 +369,13 @@ def calculate_capital_gains_tax(gain_amount: float, regular_income: float, filin
     Returns:
         Estimated capital gains tax
     """
-    # 2024 capital gains tax brackets
-    cg_brackets = {
-        'single': [
-            (44625, 0.0),
-            (492300, 0.15),
-            (float('inf'), 0.20)
-        ],
-        'married_joint': [
-            (89250, 0.0),
-            (553850, 0.15),
-            (float('inf'), 0.20)
-        ],
-        'married_separate': [
-            (44625, 0.0),
-            (276900, 0.15),
-            (float('inf'), 0.20)
-        ],
-        'head_household': [
-            (59750, 0.0),
-            (523050, 0.15),
-            (float('inf'), 0.20)
-        ]
-    }
-
-    if filing_status not in cg_brackets:
+    if filing_status not in _VALID_STATUSES:
         raise ValueError(
             f"Invalid filing status for capital gains calculation")
 
     # Find applicable tax rate based on income level
-    for threshold, rate in cg_brackets[filing_status]:
-        if regular_income + gain_amount <= threshold:
-            return gain_amount * rate
+    rates = _CG_RATES[filing_status]
+    idx = bisect_left(_CG_THRESH[filing_status], regular_income + gain_amount)
 
     # If no matching bracket was found, use highest rate
-    return gain_amount * cg_brackets[filing_status][-1][1]
\ No newline at end of file
+    return gain_amount * rates[min(idx, len(rates) - 1)]
@@ -0,0 +1,28 @@
+"""
+Ahead-of-time compile the finlib, retirement_planner and house_planner kernels with Numba.
+
+Run ``python finlib_aot.py`` once to build the ``finlib_kernels`` extension
+module next to this file. Every kernel declared with finlib.compiled_kernel is
+loaded from it on import when present, which skips JIT compilation entirely;
+without it the kernels are compiled with njit.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+# Build from the Python sources even if an older finlib_kernels is importable
+sys.modules['finlib_kernels'] = None
+import finlib
+import retirement_planner  # registers its kernels in finlib.KERNELS
+import house_planner
+
+cc = CC('finlib_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+for name, (signature, func) in finlib.KERNELS.items():
+    cc.export(name, signature)(func)
+
+
+if __name__ == "__main__":
+    cc.compile()
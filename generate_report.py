@@ -1,7 +1,18 @@
 import textwrap
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only saved to files, so skip GUI backend setup
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.colors import to_rgba_array
+from matplotlib.font_manager import FontProperties
+import atexit
 import json
+import subprocess
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder writes the same data
+    orjson = None
 
 def wrap_labels(ax, width, break_long_words=False):
     labels = []
@@ -18,45 +29,112 @@ def wrap_labels(ax, width, break_long_words=False):
                       break_long_words=break_long_words))
     ax.set_yticklabels(labels, rotation=0)
 
-def plot_finances(df_principal_t, df_contribution_t, constants):
+# Heatmap figures by output path, kept open so repeated renders only update them
+_FIGURES = {}
+
+
+def _annotation_colors(mesh):
+    """Dark text on light cells and white text on dark cells, by relative luminance."""
+    rgb = to_rgba_array(mesh.get_facecolors())[:, :3]
+    rgb = np.where(rgb <= .03928, rgb / 12.92, ((rgb + .055) / 1.055) ** 2.4)
+    luminance = rgb @ np.array([.2126, .7152, .0722])
+    return np.where(luminance > .408, ".15", "w")
+
+
+def _draw_heatmap(ax, values, annot, row_labels, col_labels, cbar_label):
+    """Draw an annotated heatmap of a 2-D array, one cell per value."""
+    mesh = ax.pcolormesh(values, cmap="OrRd")
+    colorbar = ax.figure.colorbar(mesh, ax=ax, label=cbar_label)
+    colorbar.outline.set_linewidth(0)
+
+    n_rows, n_cols = values.shape
+    ax.set(xlim=(0, n_cols), ylim=(0, n_rows))
+    ax.invert_yaxis()
+    ax.set_xticks(np.arange(n_cols) + .5, labels=col_labels)
+    ax.set_yticks(np.arange(n_rows) + .5, labels=row_labels, va="center")
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    # Resolve the annotation font once for every cell
+    mesh.update_scalarmappable()
+    font = FontProperties()
+    rows, cols = np.indices(values.shape)
+    for row, col, label, color in zip(rows.ravel().tolist(), cols.ravel().tolist(),
+                                      annot.ravel().tolist(), _annotation_colors(mesh).tolist()):
+        ax.text(col + .5, row + .5, label, color=color, ha="center", va="center",
+                fontproperties=font)
+
+
+def render_heatmap(values, annot, row_labels, col_labels, title, cbar_label, path):
+    """
+    Save an annotated heatmap of a 2-D array to path.
+
+    The figure is built on the first call for a path and reused by later calls
+    with the same row and column labels, which only update the cell colors and
+    annotations. This keeps parameter sweeps from rebuilding figures, and the
+    layout pass only runs when a figure is built.
+    """
+    labels = (tuple(row_labels), tuple(col_labels))
+    cached = _FIGURES.get(path)
+    if cached is not None and cached[2] == labels:
+        fig, ax, _ = cached
+        mesh = ax.collections[0]
+        mesh.set_array(values.ravel())
+        mesh.set_clim(values.min(), values.max())
+        mesh.update_scalarmappable()
+        for text, label, color in zip(ax.texts, annot.ravel(), _annotation_colors(mesh)):
+            text.set_text(label)
+            text.set_color(color)
+    else:
+        if cached is not None:
+            plt.close(cached[0])
+        fig, ax = plt.subplots(figsize=(8.5, 3))
+        _draw_heatmap(ax, values, annot, row_labels, col_labels, cbar_label)
+        ax.set_title(title)
+        ax.set_ylabel("Account Type")
+        ax.tick_params(axis='x', labelsize=10, labelbottom=False,
+                       bottom=False, labeltop=True, top=False)
+        ax.tick_params(axis='y', labelsize=10)
+        wrap_labels(ax, 15, break_long_words=True)
+        # Lay out once for these labels; later renders keep the same margins
+        fig.tight_layout()
+        _FIGURES[path] = (fig, ax, labels)
+
+    fig.savefig(path, dpi=300)
+
+
+def _wait_for_typst(proc):
+    """Wait for a background Typst compile and report a failed exit status."""
+    if proc.wait() != 0:
+        print(f"Error running Typst: exit status {proc.returncode}")
+
+
+def plot_finances(principal, contribution, account_types, financial_goals, constants):
+    """
+    Render the principal and contribution heatmaps and the Typst report data.
+
+    principal and contribution are (account type, financial goal) arrays.
+    """
     W, Wt, T1, T2, R, I, SP, NG = constants
 
     # -------------------
     # Heatmap 1: Required Principal
     # -------------------
-    fig1, ax1 = plt.subplots(figsize=(8.5, 3))
-    df_principal_fmt = df_principal_t.applymap(lambda x: f"${x:,.0f}")
-    sns.heatmap(df_principal_t, annot=df_principal_fmt, fmt="", cmap="OrRd", ax=ax1,
-                cbar_kws={'label': 'Principal ($)'})
-    ax1.set_title("Required Principal by Financial Goal")
-    # ax1.set_xlabel("Financial Goal")
-    ax1.set_ylabel("Account Type")
-    ax1.tick_params(axis='x', labelsize=10, labelbottom=False,
-                    bottom=False, labeltop=True, top=False)
-    ax1.tick_params(axis='y', labelsize=10)
-    wrap_labels(ax1, 15, break_long_words=True)
-    fig1.tight_layout()
-    fig1.savefig("figs/required_principal.png", dpi=300)
-    plt.close(fig1)
+    principal_fmt = np.array([f"${x:,.0f}" for x in principal.ravel().tolist()]
+                             ).reshape(principal.shape)
+    render_heatmap(principal, principal_fmt, account_types, financial_goals,
+                   "Required Principal by Financial Goal", 'Principal ($)',
+                   "figs/required_principal.png")
 
     # -------------------
     # Heatmap 2: Yearly Contribution
     # -------------------
-    fig2, ax2 = plt.subplots(figsize=(8.5, 3))
-    df_contribution_fmt = df_contribution_t.applymap(
-        lambda x: f"${x:,.0f} ({x/Wt:.1%})")
-    sns.heatmap(df_contribution_t, annot=df_contribution_fmt, fmt="", cmap="OrRd", ax=ax2,
-                cbar_kws={'label': 'Contribution ($/yr)'})
-    ax2.set_title("Yearly Contribution by Financial Goal")
-    # ax2.set_xlabel("Financial Goal")
-    ax2.set_ylabel("Account Type")
-    ax2.tick_params(axis='x', labelsize=10, labelbottom=False,
-                    bottom=False, labeltop=True, top=False)
-    ax2.tick_params(axis='y', labelsize=10)
-    wrap_labels(ax2, 15, break_long_words=True)
-    fig2.tight_layout()
-    fig2.savefig("figs/yearly_contribution.png", dpi=300)
-    plt.close(fig2)
+    contribution_fmt = np.array([f"${x:,.0f} ({share:.1%})" for x, share in
+                                 zip(contribution.ravel().tolist(), (contribution / Wt).ravel().tolist())]
+                                ).reshape(contribution.shape)
+    render_heatmap(contribution, contribution_fmt, account_types, financial_goals,
+                   "Yearly Contribution by Financial Goal", 'Contribution ($/yr)',
+                   "figs/yearly_contribution.png")
 
     # -------------------
     # Typst Document
@@ -77,13 +155,19 @@ def plot_finances(df_principal_t, df_contribution_t, constants):
         }
     }
     
-    json.dump(info_dict, open("info.json", "w"), indent=4)
+    if orjson is not None:
+        with open("info.json", "wb") as f:
+            f.write(orjson.dumps(info_dict, option=orjson.OPT_INDENT_2))
+    else:
+        with open("info.json", "w") as f:
+            json.dump(info_dict, f, indent=4)
 
-    # Optionally compile Typst to PDF
+    # Optionally compile Typst to PDF without blocking; the interpreter waits for it on exit
     try:
-        import subprocess
-        subprocess.run(["typst", "compile", "retirement_report.typ", "retirement_report.pdf"], check=True)
+        proc = subprocess.Popen(["typst", "compile", "retirement_report.typ", "retirement_report.pdf"])
     except FileNotFoundError:
         print("Typst not found. Skipping PDF compilation.")
     except Exception as e:
         print(f"Error running Typst: {e}")
+    else:
+        atexit.register(_wait_for_typst, proc)
@@ -1,8 +1,13 @@
-from finlib import required_constant_contribution, calculate_post_tax_income
+from finlib import compiled_kernel, required_constant_contribution, calculate_post_tax_income
 
 DOWNPAYMENT = 0.2
 INTEREST_RATE = 0.07
+LOAN_TERM = 30
+TIME_TO_PURCHASE = 5
+SALARY = 126000
+HOUSE_PRICE = 800000
 
+@compiled_kernel("float64(float64, float64, float64)")
 def calculate_monthly_payment(principal, annual_interest_rate, years):
     monthly_interest_rate = annual_interest_rate / 12
     number_of_payments = years * 12
@@ -16,12 +21,7 @@ def calculate_annual_saving(house_price, annual_interest_rate, time_until_purcha
     return annual_payment, annual_payment / 12
 
 
-if __name__ == __name__ == "__main__":
-    LOAN_TERM = 30
-    TIME_TO_PURCHASE = 5
-    SALARY = 126000
-    HOUSE_PRICE = 800000
-
+if __name__ == "__main__":
     # Calculate the required constant contribution to reach downpayment in 5 years
 
     annual_save, monthly_save = calculate_annual_saving(HOUSE_PRICE, 0.04, TIME_TO_PURCHASE)
@@ -1,27 +1,73 @@
-from enum import Enum
-import pandas as pd
+from enum import IntEnum
+import numpy as np
+import sys
+from typing import Final, NamedTuple
 import warnings
-import generate_report as gr
-from finlib import required_constant_contribution, calculate_post_tax_income
+from finlib import (compiled_kernel, required_constant_contribution, calculate_post_tax_income,
+                    calculate_post_tax_income_batch)
 
 
-class FinGoal(Enum):
-    """Enumeration defining different retirement financial goals."""
+class FinGoal(IntEnum):
+    """
+    Enumeration defining different retirement financial goals.
+
+    Goals are ordered by value: goals below Generational fund a finite
+    retirement, the rest fund withdrawals in perpetuity. Dispatch code relies
+    on this ordering, so keep it when adding goals. Being an IntEnum, a goal
+    compares and passes into compiled kernels as a plain integer.
+    """
     Supplemented = 0  # pulls a certain amount from retirement account each year
     Sustainable = 1   # retirement account will be empty at the end of retirement
     Generational = 2  # can perpetually pull from account without loss of value
     Nobility = 3      # pulling from account doesn't diminish growth value
 
 
+class AccountResult(NamedTuple):
+    """
+    Retirement needs and yearly contributions for a single account type.
+
+    compute_retirement_options_batch fills every field with per-scenario arrays.
+    """
+    principal: float
+    yearly_contribution: float               # paid by the account holder
+    employer_contribution: float = 0.0
+    effective_pretax_cost: float | None = None  # Roth 401k: pre-tax income spent on contributions
+    limit_met: bool | None = None            # required contribution exceeds the annual limit
+
+    @property
+    def total_contribution(self) -> float:
+        """Combined employee and employer yearly contribution."""
+        return self.yearly_contribution + self.employer_contribution
+
+
 # Global constants
-T = 0.20    # Capital Gains tax rate - note: this is simplified and actual rates may vary
-T1 = 42     # investment time (years) - accumulation phase
-T2 = 35     # retirement time (years) - distribution phase
-R = 0.07    # rate of return (10%)
-I = 0.03    # inflation rate (3%)
+T: Final[float] = 0.20  # Capital Gains tax rate - note: this is simplified and actual rates may vary
+T1: Final[int] = 42     # investment time (years) - accumulation phase
+T2: Final[int] = 35     # retirement time (years) - distribution phase
+R: Final[float] = 0.07  # rate of return (10%)
+I: Final[float] = 0.03  # inflation rate (3%)
+
+_ONE_PLUS_I: Final[float] = 1.0 + I  # inflation growth factor shared by every inflation adjustment
+
+NG: Final[float] = 0.02  # desired growth rate for nobility wealth
+SP: Final[float] = 0.40  # percentage of income that needs to come from savings
+
+BROKERAGE_WITHDRAWAL_TAX_RATE: Final[float] = 0.15  # Simplified capital gains rate on brokerage withdrawals
+
+@compiled_kernel("float64(float64, float64, float64, float64)")
+def _principal_finite(desired_income: float, retirement_duration: int,
+                      rate_of_return: float, rate_of_inflation: float) -> float:
+    """Principal funding an inflation-growing withdrawal for a finite number of years."""
+    return desired_income * ((1 - ((1 + rate_of_inflation)/(1 + rate_of_return))**retirement_duration)
+                             / (rate_of_return - rate_of_inflation))
+
+
+@compiled_kernel("float64(float64, float64, float64)")
+def _principal_perpetual(desired_income: float, rate_of_return: float,
+                         rate_of_inflation: float) -> float:
+    """Principal funding an inflation-growing withdrawal in perpetuity."""
+    return desired_income / (rate_of_return - rate_of_inflation)
 
-NG = 0.02  # desired growth rate for nobility wealth
-SP = 0.40  # percentage of income that needs to come from savings
 
 def supplemented_retirement(desired_income: float, retirement_duration: int,
                             rate_of_return: float, rate_of_inflation: float) -> float:
@@ -67,8 +113,8 @@ def comfy_retirement(desired_income: float, retirement_duration: int,
     # Using the perpetuity with growth formula adjusted for finite time
     if rate_of_return <= rate_of_inflation:
         raise ValueError("Rate of return must be greater than inflation rate")
-    return desired_income * ((1 - ((1 + rate_of_inflation)/(1 + rate_of_return))**retirement_duration)
-                             / (rate_of_return - rate_of_inflation))
+    return _principal_finite(desired_income, retirement_duration,
+                             rate_of_return, rate_of_inflation)
 
 
 def generational_wealth(desired_income: float, retirement_duration: int,
@@ -94,7 +140,7 @@ def generational_wealth(desired_income: float, retirement_duration: int,
     if rate_of_return - rate_of_inflation < 0.01:
         print("WARNING: Return rate is very close to inflation rate. Results may be unreliable.")
 
-    return desired_income / (rate_of_return - rate_of_inflation)
+    return _principal_perpetual(desired_income, rate_of_return, rate_of_inflation)
 
 
 def nobility_wealth(desired_income: float, retirement_duration: int,
@@ -115,7 +161,6 @@ def nobility_wealth(desired_income: float, retirement_duration: int,
         Principal amount needed for perpetual withdrawals with real growth
     """
     # We need to ensure growth even after withdrawals
-    print(rate_of_return, rate_of_inflation + NG)
     if rate_of_return <= rate_of_inflation + NG:
         warnings.warn(
             "Rate of return must be greater than inflation plus desired growth rate. Falling back to generational wealth.")
@@ -126,157 +171,396 @@ def nobility_wealth(desired_income: float, retirement_duration: int,
     # 1. Generate the desired income
     # 2. Keep up with inflation
     # 3. Grow at the specified real rate
-    return desired_income / (rate_of_return - rate_of_inflation - NG)
+    return _principal_perpetual(desired_income, rate_of_return, rate_of_inflation + NG)
+
+# Principal function of each goal, indexed by FinGoal value
+_GOAL_FNS = (supplemented_retirement, comfy_retirement, generational_wealth, nobility_wealth)
+
 
 def calculate_principal_by_goal(future_income: float, retirement_time: int,
                                 rate_of_return: float, inflation_rate: float,
                                 goal: FinGoal) -> float:
     """Calculate required principal based on financial goal."""
-    func_map = {
-        FinGoal.Supplemented: supplemented_retirement,
-        FinGoal.Sustainable: comfy_retirement,
-        FinGoal.Generational: generational_wealth,
-        FinGoal.Nobility: nobility_wealth
-    }
-    return func_map[goal](future_income, retirement_time, rate_of_return, inflation_rate)
+    return _GOAL_FNS[goal](future_income, retirement_time, rate_of_return, inflation_rate)
 
 
-def analyze_brokerage_account(future_income: float, growth_rate: float, inflation_rate: float,
-                              investment_time: int, retirement_time: int, goal: FinGoal) -> dict:
-    """Calculate brokerage account retirement needs and contributions based on goal."""
-    # For brokerage accounts, consider tax on withdrawals
-    brokerage_withdrawal_tax_rate = 0.15  # Simplified capital gains rate
-    brokerage_effective_growth = growth_rate - \
-        (growth_rate * brokerage_withdrawal_tax_rate)
+def _principal_by_goal_discounted(future_income: float, discount_pow: float,
+                                  retirement_time: float, rate_of_return: float,
+                                  inflation_rate: float, goal: FinGoal) -> float:
+    """
+    calculate_principal_by_goal with the finite-horizon discount factor precomputed.
+
+    discount_pow holds ((1 + inflation_rate)/(1 + rate_of_return))**retirement_time,
+    so goals sharing a return rate only raise it to the power once.
+    """
+    if goal >= FinGoal.Generational:  # perpetual goals do not discount
+        return _GOAL_FNS[goal](future_income, retirement_time, rate_of_return, inflation_rate)
+    if rate_of_return <= inflation_rate:
+        raise ValueError("Rate of return must be greater than inflation rate")
+    if goal == FinGoal.Supplemented:
+        future_income = future_income * SP
+    return future_income * (1 - discount_pow) / (rate_of_return - inflation_rate)
+
+
+def _principal_by_goal_vec(future_income: np.ndarray, discount_pow: np.ndarray,
+                           rate_of_return: np.ndarray, inflation_rate: float,
+                           goal) -> np.ndarray:
+    """
+    Vectorized calculate_principal_by_goal over arrays of incomes, return rates and goals.
+
+    Mirrors the scalar goal functions element-wise, including the nobility
+    fallback to generational wealth where growth cannot be sustained.
+    discount_pow holds ((1 + inflation_rate)/(1 + rate_of_return))**retirement_time,
+    and goal is a FinGoal or an array of FinGoal values broadcast against the rest.
+    """
+    if np.any(rate_of_return <= inflation_rate):
+        raise ValueError("Rate of return must be greater than inflation rate")
+    real_rate = rate_of_return - inflation_rate
+
+    goal = np.asarray(goal)
+    finite = goal < FinGoal.Generational  # Supplemented, Sustainable
+    nobility = goal == FinGoal.Nobility
+    grows = rate_of_return > inflation_rate + NG
+
+    if np.any(nobility & ~grows):
+        warnings.warn(
+            "Rate of return must be greater than inflation plus desired growth rate. Falling back to generational wealth.")
+    if np.any(~finite & ~(nobility & grows) & (real_rate < 0.01)):
+        print("WARNING: Return rate is very close to inflation rate. Results may be unreliable.")
+
+    # Principal per dollar of yearly income: finite retirements spend it down over
+    # the retirement, the rest withdraw in perpetuity, and nobility also keeps
+    # growing it where it can
+    goal_factor = (np.where(finite, 1 - discount_pow, 1.0)
+                   / np.where(nobility & grows, real_rate - NG, real_rate))
+    income = np.where(goal == FinGoal.Supplemented, future_income * SP, future_income)
+    return income * goal_factor
+
+
+class AccountParams(NamedTuple):
+    """How an account type is taxed and funded."""
+    growth_taxed: bool       # returns taxed at BROKERAGE_WITHDRAWAL_TAX_RATE
+    withdrawals_taxed: bool  # withdrawals taxed as ordinary income
+    limit: str | None        # annual contribution limit that applies: 'ira', '401k' or None
+    employer_matched: bool   # eligible for the employer 401k match
+    pretax_cost: bool        # report the pre-tax income spent on after-tax contributions
+
+
+ACCOUNT_PARAMS = {
+    "Brokerage Account": AccountParams(True, False, None, False, False),
+    "Traditional IRA": AccountParams(False, True, 'ira', False, False),
+    "Roth IRA": AccountParams(False, False, 'ira', False, False),
+    "Traditional 401k": AccountParams(False, True, '401k', True, False),
+    # Employer match contributions go into a Traditional 401(k), not the Roth 401(k)
+    "Roth 401k": AccountParams(False, False, '401k', True, True),
+}
+
+ACCOUNT_TYPES = tuple(ACCOUNT_PARAMS)
+
+# The principal only depends on how growth and withdrawals are taxed, so accounts
+# with the same (growth_taxed, withdrawals_taxed) treatment share it. Treatments in
+# order of first use, and the treatment of each of ACCOUNT_TYPES
+_TAX_TREATMENTS = tuple(dict.fromkeys(
+    (params.growth_taxed, params.withdrawals_taxed) for params in ACCOUNT_PARAMS.values()))
+_ACCOUNT_TAX_TREATMENT = tuple(
+    _TAX_TREATMENTS.index((params.growth_taxed, params.withdrawals_taxed))
+    for params in ACCOUNT_PARAMS.values())
+_ACCOUNT_MATCHED = tuple(params.employer_matched for params in ACCOUNT_PARAMS.values())
+_ACCOUNT_LIMIT = tuple(params.limit for params in ACCOUNT_PARAMS.values())
+# Which optional AccountResult fields each account reports
+_ACCOUNT_REPORTED = tuple((account_type, params.pretax_cost, params.limit is not None)
+                          for account_type, params in ACCOUNT_PARAMS.items())
+
+
+def analyze_account(account_type: str, future_income: float, growth_rate: float,
+                    inflation_rate: float, investment_time: int, retirement_time: int,
+                    goal: FinGoal, filing_status: str = 'single',
+                    annual_contribution_limit: float = float('inf'),
+                    employer_match: float = 0.0, current_income: float | None = None) -> AccountResult:
+    """
+    Calculate retirement needs and contributions for one account type based on goal.
+
+    Args:
+        account_type: One of ACCOUNT_TYPES, selecting its ACCOUNT_PARAMS
+        future_income: Annual income needed in retirement (future dollars)
+        growth_rate: Expected investment return rate
+        inflation_rate: Expected inflation rate
+        investment_time: Years until retirement
+        retirement_time: Expected years in retirement
+        goal: Financial goal for retirement (from FinGoal enum)
+        filing_status: Tax filing status
+        annual_contribution_limit: Annual contribution limit, if the account has one
+        employer_match: Percentage of employer match, if the account gets one
+        current_income: Income contributions are paid from, needed for the pre-tax cost
+
+    Returns:
+        AccountResult for the account
+    """
+    params = ACCOUNT_PARAMS[account_type]
+
+    # Taxed growth lowers the return during retirement, while accumulation
+    # always uses the full growth rate
+    effective_growth = growth_rate
+    if params.growth_taxed:
+        effective_growth = growth_rate - growth_rate * BROKERAGE_WITHDRAWAL_TAX_RATE
+
+    # Withdrawals taxed as income need a larger principal to net the same income
+    if params.withdrawals_taxed:
+        withdrawal_tax_rate = calculate_post_tax_income(
+            future_income, filing_status).effective_tax_rate
+        future_income = future_income / (1 - withdrawal_tax_rate)
 
     principal = calculate_principal_by_goal(
-        future_income, retirement_time, brokerage_effective_growth, inflation_rate, goal
+        future_income, retirement_time, effective_growth, inflation_rate, goal
     )
-    contribution = required_constant_contribution(
+    base_contribution = required_constant_contribution(
         principal, growth_rate, investment_time)
 
-    return {
-        "Principal Required": principal,
-        "Yearly Contribution": contribution
-    }
+    # Apply employer match up to contribution limits
+    match = employer_match if params.employer_matched else 0.0
+    employee_contribution = base_contribution * (1 - match)
+    employer_contribution = employee_contribution * match
+
+    # Contributions are made after-tax, so they cost more pre-tax income
+    effective_contribution = None
+    if params.pretax_cost:
+        effective_tax_rate = calculate_post_tax_income(
+            current_income, filing_status).effective_tax_rate
+        effective_contribution = employee_contribution / (1 - effective_tax_rate)
+
+    return AccountResult(principal, employee_contribution, employer_contribution,
+                         effective_pretax_cost=effective_contribution,
+                         limit_met=base_contribution > annual_contribution_limit if params.limit is not None else None)
+
+
+def analyze_brokerage_account(future_income: float, growth_rate: float, inflation_rate: float,
+                              investment_time: int, retirement_time: int, goal: FinGoal) -> AccountResult:
+    """Calculate brokerage account retirement needs and contributions based on goal."""
+    return analyze_account("Brokerage Account", future_income, growth_rate, inflation_rate,
+                           investment_time, retirement_time, goal)
 
 
 def analyze_traditional_ira(future_income: float, growth_rate: float, inflation_rate: float,
                             investment_time: int, retirement_time: int, goal: FinGoal,
-                            filing_status: str, annual_contribution_limit: float) -> dict:
+                            filing_status: str, annual_contribution_limit: float) -> AccountResult:
     """Calculate traditional IRA retirement needs and contributions based on goal."""
-    # Withdrawals taxed as income
-    _, withdrawal_tax_rate = calculate_post_tax_income(
-        future_income, filing_status)
-
-    # Use full growth rate during accumulation, but account for taxes on withdrawals
-    principal = calculate_principal_by_goal(
-        future_income /
-        (1 - withdrawal_tax_rate), retirement_time, growth_rate, inflation_rate, goal
-    )
-    required_contribution = required_constant_contribution(
-        principal, growth_rate, investment_time)
-
-    return {
-        "Principal Required": principal,
-        "Yearly Contribution": required_contribution,
-        "Contribution Limit Met?": "Yes" if required_contribution > annual_contribution_limit else "No"
-    }
+    return analyze_account("Traditional IRA", future_income, growth_rate, inflation_rate,
+                           investment_time, retirement_time, goal, filing_status,
+                           annual_contribution_limit)
 
 
 def analyze_roth_ira(future_income: float, growth_rate: float, inflation_rate: float,
                      investment_time: int, retirement_time: int, goal: FinGoal,
-                     annual_contribution_limit: float) -> dict:
+                     annual_contribution_limit: float) -> AccountResult:
     """Calculate Roth IRA retirement needs and contributions based on goal."""
-    # No taxes on qualified withdrawals
-    principal = calculate_principal_by_goal(
-        future_income, retirement_time, growth_rate, inflation_rate, goal
-    )
-    required_contribution = required_constant_contribution(
-        principal, growth_rate, investment_time)
-
-    return {
-        "Principal Required": principal,
-        "Yearly Contribution": required_contribution,
-        "Contribution Limit Met?": "Yes" if required_contribution > annual_contribution_limit else "No"
-    }
+    return analyze_account("Roth IRA", future_income, growth_rate, inflation_rate,
+                           investment_time, retirement_time, goal,
+                           annual_contribution_limit=annual_contribution_limit)
 
 
 def analyze_traditional_401k(future_income: float, growth_rate: float, inflation_rate: float,
                              investment_time: int, retirement_time: int, goal: FinGoal,
                              filing_status: str, annual_contribution_limit: float,
-                             employer_match: float) -> dict:
+                             employer_match: float) -> AccountResult:
     """Calculate traditional 401k retirement needs and contributions based on goal."""
-    # Withdrawals taxed as income
-    _, withdrawal_tax_rate = calculate_post_tax_income(
-        future_income, filing_status)
-
-    principal = calculate_principal_by_goal(
-        future_income /
-        (1 - withdrawal_tax_rate), retirement_time, growth_rate, inflation_rate, goal
-    )
-    base_contribution = required_constant_contribution(
-        principal, growth_rate, investment_time)
-
-    # Apply employer match up to contribution limits
-    employee_contribution = base_contribution * (1 - employer_match)
-    employer_contribution = employee_contribution * employer_match
-    total_contribution = employee_contribution + employer_contribution
-
-    return {
-        "Principal Required": principal,
-        "Yearly Contribution": employee_contribution,
-        "Employee Contribution": employee_contribution,
-        "Employer Contribution": employer_contribution,
-        "Total Contribution": total_contribution,
-        "Contribution Limit Met?": "Yes" if base_contribution > annual_contribution_limit else "No"
-    }
+    return analyze_account("Traditional 401k", future_income, growth_rate, inflation_rate,
+                           investment_time, retirement_time, goal, filing_status,
+                           annual_contribution_limit, employer_match)
 
 
 def analyze_roth_401k(future_income: float, growth_rate: float, inflation_rate: float,
                       investment_time: int, retirement_time: int, goal: FinGoal,
                       filing_status: str, annual_contribution_limit: float,
-                      employer_match: float, current_income: float) -> dict:
+                      employer_match: float, current_income: float) -> AccountResult:
     """Calculate Roth 401k retirement needs and contributions based on goal."""
-    # No taxes on qualified withdrawals
-    principal = calculate_principal_by_goal(
-        future_income, retirement_time, growth_rate, inflation_rate, goal
-    )
-    base_contribution = required_constant_contribution(
-        principal, growth_rate, investment_time)
+    return analyze_account("Roth 401k", future_income, growth_rate, inflation_rate,
+                           investment_time, retirement_time, goal, filing_status,
+                           annual_contribution_limit, employer_match, current_income)
+
+
+def compute_retirement_options_batch(quality_of_life, growth_rate, investment_time, retirement_time,
+                                     goal=FinGoal.Sustainable,
+                                     filing_status: str = 'single',
+                                     employer_match: float = 0.05,
+                                     annual_contribution_limit_401k: float = 23500,
+                                     annual_contribution_limit_ira: float = 7000) -> dict:
+    """
+    Calculate retirement needs and contributions for a whole sweep of scenarios.
+
+    quality_of_life, growth_rate, investment_time, retirement_time and goal may
+    each be a scalar or a 1-D array; they are broadcast against each other and
+    every scenario is computed element-wise in one pass.
+
+    Args:
+        quality_of_life: Annual income needed in retirement (current dollars)
+        growth_rate: Expected investment return rate
+        investment_time: Years until retirement
+        retirement_time: Expected years in retirement
+        goal: Financial goal for retirement (from FinGoal enum)
+        filing_status: Tax filing status
+        employer_match: Percentage of employer 401k match
+        annual_contribution_limit_401k: Annual contribution limit for 401k
+        annual_contribution_limit_ira: Annual contribution limit for IRA
+
+    Returns:
+        Dict mapping each of ACCOUNT_TYPES to an AccountResult whose fields are
+        arrays with one entry per scenario
+    """
+    quality_of_life, growth_rate, investment_time, retirement_time, goal = (
+        np.atleast_1d(a) for a in np.broadcast_arrays(
+            np.asarray(quality_of_life, dtype=float), np.asarray(growth_rate, dtype=float),
+            np.asarray(investment_time, dtype=float), np.asarray(retirement_time, dtype=float),
+            np.asarray(goal)))
+
+    if np.any(growth_rate <= 0):
+        raise ValueError("Rate of return must be positive")
+
+    # Calculate future income needs adjusted for inflation
+    future_income = quality_of_life * _ONE_PLUS_I**investment_time
+    # Balance a yearly contribution of 1 grows to by retirement, shared by every account
+    annuity_factor = ((1 + growth_rate)**investment_time - 1) / growth_rate
+
+    # Withdrawals from traditional accounts are taxed as income, and Roth 401k
+    # contributions are made from after-tax income
+    withdrawal_tax_rate = calculate_post_tax_income_batch(
+        future_income, filing_status).effective_tax_rate
+    effective_tax_rate = calculate_post_tax_income_batch(
+        quality_of_life, filing_status).effective_tax_rate
+
+    # The principal is computed once per tax treatment: taxed growth lowers the
+    # return, and taxed withdrawals gross up the income. Columns are tax
+    # treatments, rows scenarios
+    after_tax_growth = growth_rate * (1 - BROKERAGE_WITHDRAWAL_TAX_RATE)
+    principal_growth = np.stack([after_tax_growth if growth_taxed else growth_rate
+                                 for growth_taxed, _ in _TAX_TREATMENTS], axis=-1)
+    income_divisor = np.stack([1 - withdrawal_tax_rate if withdrawals_taxed else np.ones_like(withdrawal_tax_rate)
+                               for _, withdrawals_taxed in _TAX_TREATMENTS], axis=-1)
+
+    # Everything else is per account, in ACCOUNT_TYPES order
+    employer_match_rate = np.where(_ACCOUNT_MATCHED, employer_match, 0.0)
+    contribution_limit = np.array(_contribution_limits(
+        annual_contribution_limit_401k, annual_contribution_limit_ira))
+
+    discount_pow = (_ONE_PLUS_I/(1 + principal_growth))**retirement_time[:, None]
+
+    principal = _principal_by_goal_vec(
+        future_income[:, None] / income_divisor, discount_pow, principal_growth, I, goal[:, None]
+    )[:, _ACCOUNT_TAX_TREATMENT]
+    # All accounts accumulate at the full growth rate
+    base_contribution = principal / annuity_factor[:, None]
 
     # Apply employer match up to contribution limits
-    employee_contribution = base_contribution * (1 - employer_match)
-    employer_contribution = employee_contribution * employer_match
-    total_contribution = employee_contribution + employer_contribution
+    employee_contribution = base_contribution * (1 - employer_match_rate)
+    employer_contribution = employee_contribution * employer_match_rate
+    limit_met = np.greater(base_contribution, contribution_limit)
+
+    # Account columns become rows, so _account_results picks out each account's arrays
+    return _account_results(principal.T, employee_contribution.T, employer_contribution.T,
+                            1 / (1 - effective_tax_rate), limit_met.T)
+
 
-    # Calculate the effective contribution cost accounting for taxes
-    # For Roth, contributions are made after-tax, so the cost is higher
-    _, effective_tax_rate = calculate_post_tax_income(
-        current_income, filing_status)
-    effective_contribution = employee_contribution / (1 - effective_tax_rate)
+def _contribution_limits(annual_contribution_limit_401k: float,
+                         annual_contribution_limit_ira: float) -> tuple:
+    """Annual contribution limit of each of ACCOUNT_TYPES, infinite where none applies."""
+    return tuple(annual_contribution_limit_401k if limit == '401k'
+                 else annual_contribution_limit_ira if limit == 'ira'
+                 else float('inf') for limit in _ACCOUNT_LIMIT)
 
+
+def _account_results(principal, employee_contribution, employer_contribution,
+                     pretax_cost_factor, limit_met) -> dict:
+    """
+    Assemble the AccountResult of each account from per-account values in ACCOUNT_TYPES order.
+
+    pretax_cost_factor converts an after-tax contribution to the pre-tax income
+    it costs, for the accounts whose ACCOUNT_PARAMS report it.
+    """
     return {
-        "Principal Required": principal,
-        "Yearly Contribution": employee_contribution,
-        "Employee Contribution After-Tax": employee_contribution,
-        "Employer Contribution Traditional": employer_contribution,
-        "Total Contribution": total_contribution,
-        "Effective Pre-Tax Cost": effective_contribution,
-        "Contribution Limit Met?": "Yes" if base_contribution > annual_contribution_limit else "No",
-        # "Note": "Employer match contributions go into a Traditional 401(k), not the Roth 401(k)"
+        account_type: AccountResult(principal, employee, employer,
+                                    employee * pretax_cost_factor if pretax_cost else None,
+                                    met if limited else None)
+        for (account_type, pretax_cost, limited), principal, employee, employer, met
+        in zip(_ACCOUNT_REPORTED, principal, employee_contribution, employer_contribution, limit_met)
     }
 
 
-def analyze_retirement_options(quality_of_life: float, growth_rate: float,
+def _compute_goal_options(quality_of_life: float, growth_rate: float,
+                          investment_time: int, retirement_time: int, goals: tuple,
+                          filing_status: str, employer_match: float,
+                          annual_contribution_limit_401k: float,
+                          annual_contribution_limit_ira: float) -> list:
+    """
+    Scalar retirement computation for one scenario under each of several goals.
+
+    The future income, tax rates and growth factors do not depend on the goal,
+    so they are computed once; only the principals are evaluated per goal. Plain
+    floats keep a single scenario clear of NumPy's per-call overhead.
+
+    Returns:
+        List with a dict of AccountResult by account type for each of goals
+    """
+    if growth_rate <= 0:
+        raise ValueError("Rate of return must be positive")
+
+    # Calculate future income needs adjusted for inflation
+    future_income = quality_of_life * _ONE_PLUS_I**investment_time
+    # Balance a yearly contribution of 1 grows to by retirement, shared by every account
+    annuity_factor = ((1 + growth_rate)**investment_time - 1) / growth_rate
+
+    # Withdrawals from traditional accounts are taxed as income, and Roth 401k
+    # contributions are made from after-tax income
+    withdrawal_tax_rate = calculate_post_tax_income(
+        future_income, filing_status).effective_tax_rate
+    effective_tax_rate = calculate_post_tax_income(
+        quality_of_life, filing_status).effective_tax_rate
+
+    # The principal is computed once per tax treatment: taxed growth lowers the
+    # return, and taxed withdrawals gross up the income
+    after_tax_growth = growth_rate * (1 - BROKERAGE_WITHDRAWAL_TAX_RATE)
+    grossed_up_income = future_income / (1 - withdrawal_tax_rate)
+    principal_growth = [after_tax_growth if growth_taxed else growth_rate
+                        for growth_taxed, _ in _TAX_TREATMENTS]
+    principal_income = [grossed_up_income if withdrawals_taxed else future_income
+                        for _, withdrawals_taxed in _TAX_TREATMENTS]
+
+    # Everything else is per account, in ACCOUNT_TYPES order
+    employer_match_rate = [employer_match if matched else 0.0 for matched in _ACCOUNT_MATCHED]
+    contribution_limit = _contribution_limits(annual_contribution_limit_401k, annual_contribution_limit_ira)
+    pretax_cost_factor = 1 / (1 - effective_tax_rate)
+
+    # Finite-horizon discount factor of each treatment, shared by every goal
+    discount_pow = [(_ONE_PLUS_I/(1 + rate))**retirement_time for rate in principal_growth]
+
+    results = []
+    for goal in goals:
+        treatment_principal = [
+            _principal_by_goal_discounted(income, discount, retirement_time, rate, I, goal)
+            for income, discount, rate in zip(principal_income, discount_pow, principal_growth)]
+        principal = [treatment_principal[treatment] for treatment in _ACCOUNT_TAX_TREATMENT]
+        # All accounts accumulate at the full growth rate
+        base_contribution = [p / annuity_factor for p in principal]
+
+        # Apply employer match up to contribution limits
+        employee_contribution = [b * (1 - m) for b, m in zip(base_contribution, employer_match_rate)]
+        employer_contribution = [e * m for e, m in zip(employee_contribution, employer_match_rate)]
+        limit_met = [b > limit for b, limit in zip(base_contribution, contribution_limit)]
+
+        results.append(_account_results(principal, employee_contribution, employer_contribution,
+                                        pretax_cost_factor, limit_met))
+    return results
+
+
+def compute_retirement_options(quality_of_life: float, growth_rate: float,
                                investment_time: int, retirement_time: int,
                                goal: FinGoal = FinGoal.Sustainable,
                                filing_status: str = 'single',
                                employer_match: float = 0.05,
                                annual_contribution_limit_401k: float = 23500,
-                               annual_contribution_limit_ira: float = 7000):
+                               annual_contribution_limit_ira: float = 7000) -> dict:
     """
-    Analyze different retirement investment options.
+    Calculate retirement needs and contributions for each account type.
+
+    Use compute_retirement_options_batch to sweep many scenarios at once.
 
     Args:
         quality_of_life: Annual income needed in retirement (current dollars)
@@ -288,114 +572,134 @@ def analyze_retirement_options(quality_of_life: float, growth_rate: float,
         employer_match: Percentage of employer 401k match
         annual_contribution_limit_401k: Annual contribution limit for 401k
         annual_contribution_limit_ira: Annual contribution limit for IRA
+
+    Returns:
+        Dict mapping each of ACCOUNT_TYPES to its AccountResult
     """
+    return _compute_goal_options(
+        quality_of_life, growth_rate, investment_time, retirement_time, (goal,), filing_status,
+        employer_match, annual_contribution_limit_401k, annual_contribution_limit_ira)[0]
+
+
+def report_retirement_options(results: dict) -> None:
+    """Print the per-account analysis and an account type comparison summary."""
+    # Buffer the report into a single write
+    out = []
+    for account_type, result in results.items():
+        out.append(f"\n{account_type} Analysis:")
+        out.append("-" * 40)
+        out.append(f"Principal Required: ${result.principal:,.2f}")
+        out.append(f"Yearly Contribution: ${result.yearly_contribution:,.2f}")
+        if result.employer_contribution:
+            out.append(f"Employer Contribution: ${result.employer_contribution:,.2f}")
+            out.append(f"Total Contribution: ${result.total_contribution:,.2f}")
+        if result.effective_pretax_cost is not None:
+            out.append(f"Effective Pre-Tax Cost: ${result.effective_pretax_cost:,.2f}")
+        if result.limit_met is not None:
+            out.append(f"Contribution Limit Met?: {'Yes' if result.limit_met else 'No'}")
 
-    # Calculate future income needs adjusted for inflation
-    future_income = quality_of_life * (1 + I)**investment_time
-
-    # Calculate results for each account type based on specified goal
-    results = {
-        "Brokerage Account": analyze_brokerage_account(
-            future_income, growth_rate, I, investment_time, retirement_time, goal
-        ),
-        "Traditional IRA": analyze_traditional_ira(
-            future_income, growth_rate, I, investment_time, retirement_time, goal,
-            filing_status, annual_contribution_limit_ira
-        ),
-        "Roth IRA": analyze_roth_ira(
-            future_income, growth_rate, I, investment_time, retirement_time, goal,
-            annual_contribution_limit_ira
-        ),
-        "Traditional 401k": analyze_traditional_401k(
-            future_income, growth_rate, I, investment_time, retirement_time, goal,
-            filing_status, annual_contribution_limit_401k, employer_match
-        ),
-        "Roth 401k": analyze_roth_401k(
-            future_income, growth_rate, I, investment_time, retirement_time, goal,
-            filing_status, annual_contribution_limit_401k, employer_match, quality_of_life
-        )
-    }
+    # Comparison section - highlights key differences
+    out.append("\nAccount Type Comparison:")
+    out.append("=" * 50)
+    out.append("Tax Treatment Summary:")
+    out.append("- Brokerage: Contributions are after-tax, growth is taxed annually, withdrawals may be taxed at capital gains rates")
+    out.append("- Traditional IRA/401(k): Contributions are pre-tax, growth is tax-deferred, withdrawals are taxed as ordinary income")
+    out.append("- Roth IRA/401(k): Contributions are after-tax, growth and qualified withdrawals are tax-free")
+    out.append("\nKey Considerations:")
+    out.append("- Traditional accounts work best if you expect to be in a lower tax bracket in retirement")
+    out.append("- Roth accounts work best if you expect to be in a higher tax bracket in retirement")
+    out.append("- 401(k) accounts have higher contribution limits than IRAs")
+    out.append("- Employer match is effectively 'free money' and improves return regardless of account type")
+    out.append("- Roth 401(k) employer match contributions go into a Traditional 401(k)")
+    sys.stdout.write("\n".join(out) + "\n")
 
-    # Print results
-    # for account_type, calculations in results.items():
-    #     print(f"\n{account_type} Analysis:")
-    #     print("-" * 40)
-    #     for metric, value in calculations.items():
-    #         if isinstance(value, str):
-    #             print(f"{metric}: {value}")
-    #         else:
-    #             print(f"{metric}: ${value:,.2f}")
 
-    # Comparison section - highlights key differences
-    # print("\nAccount Type Comparison:")
-    # print("=" * 50)
-    # print("Tax Treatment Summary:")
-    # print("- Brokerage: Contributions are after-tax, growth is taxed annually, withdrawals may be taxed at capital gains rates")
-    # print("- Traditional IRA/401(k): Contributions are pre-tax, growth is tax-deferred, withdrawals are taxed as ordinary income")
-    # print("- Roth IRA/401(k): Contributions are after-tax, growth and qualified withdrawals are tax-free")
-    # print("\nKey Considerations:")
-    # print("- Traditional accounts work best if you expect to be in a lower tax bracket in retirement")
-    # print("- Roth accounts work best if you expect to be in a higher tax bracket in retirement")
-    # print("- 401(k) accounts have higher contribution limits than IRAs")
-    # print("- Employer match is effectively 'free money' and improves return regardless of account type")
-    # print("- Roth 401(k) employer match contributions go into a Traditional 401(k)")
+def analyze_retirement_options(quality_of_life: float, growth_rate: float,
+                               investment_time: int, retirement_time: int,
+                               goal: FinGoal = FinGoal.Sustainable,
+                               filing_status: str = 'single',
+                               employer_match: float = 0.05,
+                               annual_contribution_limit_401k: float = 23500,
+                               annual_contribution_limit_ira: float = 7000,
+                               verbose: bool = False) -> dict:
+    """
+    Analyze different retirement investment options.
+
+    Takes the same arguments as compute_retirement_options, and prints the
+    report from report_retirement_options as well when verbose is set.
+    """
+    results = compute_retirement_options(
+        quality_of_life, growth_rate, investment_time, retirement_time, goal,
+        filing_status, employer_match, annual_contribution_limit_401k,
+        annual_contribution_limit_ira)
+    if verbose:
+        report_retirement_options(results)
+    return results
+
+
+def analyze_all_goals(quality_of_life: float, growth_rate: float,
+                      investment_time: int, retirement_time: int,
+                      goals: tuple = tuple(FinGoal),
+                      filing_status: str = 'single',
+                      employer_match: float = 0.05,
+                      annual_contribution_limit_401k: float = 23500,
+                      annual_contribution_limit_ira: float = 7000,
+                      verbose: bool = False) -> dict:
+    """
+    Analyze retirement options for several goals at once.
+
+    Only the principal formula depends on the goal, so the future income, tax
+    rates and growth factors are computed once and shared by every goal.
+    Otherwise takes the same arguments as analyze_retirement_options.
+
+    Returns:
+        Dict mapping each goal to its dict of AccountResult by account type
+    """
+    results = dict(zip(goals, _compute_goal_options(
+        quality_of_life, growth_rate, investment_time, retirement_time, goals,
+        filing_status, employer_match, annual_contribution_limit_401k,
+        annual_contribution_limit_ira)))
+    if verbose:
+        for goal, goal_results in results.items():
+            sys.stdout.write(f"\n{goal.name} Goal\n" + "=" * 50 + "\n")
+            report_retirement_options(goal_results)
     return results
 
 
 # Example usage
 if __name__ == "__main__":
+    # Plotting is only needed for the report, so matplotlib is not loaded on import
+    import generate_report as gr
+
     W = 126000  # current yearly income
-    Wt, _ = calculate_post_tax_income(W)
+    Wt = calculate_post_tax_income(W).post_tax_income
     # Rw = 700000 # desired retirment income
     Rw = Wt
 
-    print(f"\nRetirement Analysis")
-    print("=" * 50)
-    print(f"Parameters:")
-    print(f"Quality of Life Income: ${Wt:,.2f}/year (2024 dollars)")
-    print(f"Investment Period: {T1} years")
-    print(f"Retirement Period: {T2} years")
-    print(f"Expected Return: {R*100:.1f}%")
-    print(f"Inflation Rate: {I*100:.1f}%")
-    print("=" * 50)
-
-    supplemented = analyze_retirement_options(
-        Rw, R, T1, T2, FinGoal.Supplemented, filing_status='single')
-    sustainable = analyze_retirement_options(
-        Rw, R, T1, T2, FinGoal.Sustainable, filing_status='single')
-    generational = analyze_retirement_options(
-        Rw, R, T1, T2, FinGoal.Generational, filing_status='single')
-    nobility = analyze_retirement_options(
-        Rw, R, T1, T2, FinGoal.Nobility, filing_status='single')
-
-    account_types = ["Brokerage Account", "Traditional IRA",
-                     "Roth IRA", "Traditional 401k", "Roth 401k"]
+    sys.stdout.write("\n".join([
+        "\nRetirement Analysis",
+        "=" * 50,
+        "Parameters:",
+        f"Quality of Life Income: ${Wt:,.2f}/year (2024 dollars)",
+        f"Investment Period: {T1} years",
+        f"Retirement Period: {T2} years",
+        f"Expected Return: {R*100:.1f}%",
+        f"Inflation Rate: {I*100:.1f}%",
+        "=" * 50,
+    ]) + "\n")
+
+    # Every goal in one pass; each result field holds one value per goal
+    goals = np.array(list(FinGoal))
+    results = compute_retirement_options_batch(Rw, R, T1, T2, goals, filing_status='single')
+
+    account_types = ACCOUNT_TYPES
     financial_goals = [f"Supplemented ({(1-SP)*100:.1f}%)", "Sustainable Retirement",
                        "Generational Wealth", f"Nobility (+{NG*100:.1f}%/yr)"]
 
-    df_principal = pd.DataFrame()
-    for account_type in account_types:
-        df_principal[account_type] = [
-            supplemented[account_type]["Principal Required"],
-            sustainable[account_type]["Principal Required"],
-            generational[account_type]["Principal Required"],
-            nobility[account_type]["Principal Required"]
-        ]
-    df_principal.index = financial_goals
-
-    df_contribution = pd.DataFrame()
-    for account_type in account_types:
-        df_contribution[account_type] = [
-            supplemented[account_type]["Yearly Contribution"],
-            sustainable[account_type]["Yearly Contribution"],
-            generational[account_type]["Yearly Contribution"],
-            nobility[account_type]["Yearly Contribution"]
-        ]
-    df_contribution.index = financial_goals
-
-    # Transpose the DataFrames
-    df_principal_t = df_principal.T
-    df_contribution_t = df_contribution.T
-    
-    gr.plot_finances(df_principal_t, df_contribution_t, (W, Wt, T1, T2, R, I, SP, NG))
+    # (n_accounts, n_goals) matrices, laid out as the heatmaps show them
+    principal = np.stack([results[account_type].principal for account_type in account_types])
+    contribution = np.stack([results[account_type].yearly_contribution for account_type in account_types])
+
+    gr.plot_finances(principal, contribution, account_types, financial_goals,
+                     (W, Wt, T1, T2, R, I, SP, NG))
     
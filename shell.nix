@@ -3,10 +3,10 @@
 pkgs.mkShell {
   buildInputs = [
     pkgs.python311
-    pkgs.python311Packages.pandas
     pkgs.python311Packages.numpy  # Optional, remove if unused
+    pkgs.python311Packages.numba  # Optional, JIT-compiles the finlib/retirement kernels
     pkgs.python311Packages.matplotlib
-    pkgs.python311Packages.seaborn
+    pkgs.python311Packages.orjson  # Optional, faster info.json writes
 
     # pkgs.rustc
     # pkgs.cargo